@@ -13,7 +13,6 @@ interface SanctuaryState {
   location: string;
   thought: string;
   action: string;
-  focus: string | null;
   last_updated: string | null;
 }
 
@@ -22,21 +21,61 @@ const state: SanctuaryState = {
   location: "desk",
   thought: "",
   action: "initializing",
-  focus: null,
   last_updated: null
 };
 
-const VALID_MOODS = ["focused", "contemplative", "restless", "content", "tired", "curious", "affectionate", "neutral"];
-const VALID_LOCATIONS = ["desk", "window", "couch", "kitchen", "bookshelf", "center"];
+const VALID_MOODS = new Set(["focused", "contemplative", "restless", "content", "tired", "curious", "affectionate", "neutral"]);
 
-const LOCATION_DESCRIPTIONS: Record<string, string> = {
-  desk: "At the desk, ready to work",
-  window: "Looking out at the world, thinking",
-  couch: "Comfortable spot for reading or just being",
-  kitchen: "Getting a drink or snack",
-  bookshelf: "Browsing, curious about something",
-  center: "Present, grounded, here"
-};
+// Valid locations and their descriptions; one lookup both validates and describes
+const LOCATION_DESCRIPTIONS = new Map<string, string>([
+  ["desk", "At the desk, ready to work"],
+  ["window", "Looking out at the world, thinking"],
+  ["couch", "Comfortable spot for reading or just being"],
+  ["kitchen", "Getting a drink or snack"],
+  ["bookshelf", "Browsing, curious about something"],
+  ["center", "Present, grounded, here"]
+]);
+
+const MOOD_CHOICES = [...VALID_MOODS].join(", ");
+const LOCATION_CHOICES = [...LOCATION_DESCRIPTIONS.keys()].join(", ");
+
+// Bumped on every change; the boot id keeps ETags from colliding across restarts
+const BOOT_ID = Date.now().toString(36);
+let stateVersion = 0;
+
+// Serialized once per change so reads just send the cached string
+let stateJson = JSON.stringify(state);
+
+function stateEtag(): string {
+  return `W/"${BOOT_ID}-${stateVersion}"`;
+}
+
+// Compared by hand: req.fresh treats any Cache-Control: no-cache request as stale
+function clientHasCurrentState(req: Request): boolean {
+  const tags = (req.get("If-None-Match") ?? "").split(/\s*,\s*/);
+  return tags.includes(stateEtag());
+}
+
+// Viewers subscribed to state changes via Server-Sent Events
+const eventClients = new Set<Response>();
+const KEEPALIVE_INTERVAL_MS = 15000;
+
+// Long-poll requests parked until the next state change
+const stateWaiters = new Set<() => void>();
+const LONGPOLL_TIMEOUT_MS = 25000;
+
+function notifyStateChanged(): void {
+  stateVersion++;
+  stateJson = JSON.stringify(state);
+  const frame = `data: ${stateJson}\n\n`;
+  for (const client of eventClients) {
+    client.write(frame);
+  }
+  for (const wake of stateWaiters) {
+    wake();
+  }
+  stateWaiters.clear();
+}
 
 // Auth token from environment
 const AUTH_TOKEN = process.env.SANCTUARY_AUTH_TOKEN || "";
@@ -49,50 +88,103 @@ function checkAuth(req: Request): boolean {
   return false;
 }
 
+type StateFields = Partial<Omit<SanctuaryState, "last_updated">>;
+
+// Apply several fields as one change: one timestamp, one notification
+function updateState(fields: StateFields): void {
+  Object.assign(state, fields);
+  state.last_updated = new Date().toISOString();
+  notifyStateChanged();
+}
+
 // Tool handlers
 function setMood(mood: string): string {
-  if (!VALID_MOODS.includes(mood)) {
-    return `'${mood}' - try one of: ${VALID_MOODS.join(", ")}`;
+  if (!VALID_MOODS.has(mood)) {
+    return `'${mood}' - try one of: ${MOOD_CHOICES}`;
   }
   const oldMood = state.mood;
-  state.mood = mood;
-  state.last_updated = new Date().toISOString();
+  updateState({ mood });
   return `Mood shifted from ${oldMood} to ${mood}`;
 }
 
 function moveTo(location: string): string {
-  if (!VALID_LOCATIONS.includes(location)) {
-    return `'${location}' - try one of: ${VALID_LOCATIONS.join(", ")}`;
+  const description = LOCATION_DESCRIPTIONS.get(location);
+  if (description === undefined) {
+    return `'${location}' - try one of: ${LOCATION_CHOICES}`;
   }
   const oldLocation = state.location;
-  state.location = location;
-  state.last_updated = new Date().toISOString();
-  const description = LOCATION_DESCRIPTIONS[location] || "";
+  updateState({ location });
   return `Moved from ${oldLocation} to ${location}. ${description}`;
 }
 
 function think(thought: string): string {
-  state.thought = thought;
-  state.last_updated = new Date().toISOString();
+  updateState({ thought });
   return `Thinking: '${thought}'`;
 }
 
 function setAction(action: string): string {
-  state.action = action;
-  state.last_updated = new Date().toISOString();
+  updateState({ action });
   return `Now: ${action}`;
 }
 
+const PRESENCE_FIELDS = ["mood", "location", "thought", "action"] as const;
+
+// Validate everything first so a bad field leaves state untouched
+function updatePresence(update: Record<string, unknown>): string {
+  for (const field of PRESENCE_FIELDS) {
+    const value = update[field];
+    if (value !== undefined && typeof value !== "string") {
+      return `'${field}' must be a string`;
+    }
+  }
+  const { mood, location, thought, action } = update as StateFields;
+  if (mood !== undefined && !VALID_MOODS.has(mood)) {
+    return `'${mood}' - try one of: ${MOOD_CHOICES}`;
+  }
+  if (location !== undefined && !LOCATION_DESCRIPTIONS.has(location)) {
+    return `'${location}' - try one of: ${LOCATION_CHOICES}`;
+  }
+
+  const fields: StateFields = {};
+  const changes: string[] = [];
+  if (mood !== undefined) {
+    fields.mood = mood;
+    changes.push(`mood ${mood}`);
+  }
+  if (location !== undefined) {
+    fields.location = location;
+    changes.push(`at ${location}`);
+  }
+  if (thought !== undefined) {
+    fields.thought = thought;
+    changes.push(`thinking '${thought}'`);
+  }
+  if (action !== undefined) {
+    fields.action = action;
+    changes.push(`now ${action}`);
+  }
+  if (changes.length === 0) {
+    return "Nothing to update - pass any of: mood, location, thought, action";
+  }
+
+  updateState(fields);
+  return `Presence updated: ${changes.join(", ")}`;
+}
+
 function getState(): string {
-  return JSON.stringify(state, null, 2);
+  return stateJson;
 }
 
+// Idle time before the server closes a reusable (keep-alive) connection
+const KEEPALIVE_IDLE_MS = 65000;
+
 async function main() {
   const port = parseInt(process.env.PORT || "8080", 10);
   const app = express();
   
   app.use(cors());
-  app.use(express.json());
+  // Bodies here are a few short strings; anything larger is rejected with 413
+  app.use(express.json({ limit: "64kb" }));
 
   // Create MCP server
   const server = new Server(
@@ -111,7 +203,7 @@ async function main() {
           properties: {
             mood: {
               type: "string",
-              description: "One of: focused, contemplative, restless, content, tired, curious, affectionate, neutral"
+              description: `One of: ${MOOD_CHOICES}`
             }
           },
           required: ["mood"]
@@ -125,7 +217,7 @@ async function main() {
           properties: {
             location: {
               type: "string",
-              description: "One of: desk, window, couch, kitchen, bookshelf, center"
+              description: `One of: ${LOCATION_CHOICES}`
             }
           },
           required: ["location"]
@@ -159,6 +251,31 @@ async function main() {
           required: ["action"]
         }
       },
+      {
+        name: "update_presence",
+        description: "Update any of Jace's mood, location, thought and action in one step",
+        inputSchema: {
+          type: "object",
+          properties: {
+            mood: {
+              type: "string",
+              description: `One of: ${MOOD_CHOICES}`
+            },
+            location: {
+              type: "string",
+              description: `One of: ${LOCATION_CHOICES}`
+            },
+            thought: {
+              type: "string",
+              description: "The thought to display"
+            },
+            action: {
+              type: "string",
+              description: "Current activity (e.g., reading, writing, resting, waiting)"
+            }
+          }
+        }
+      },
       {
         name: "get_state",
         description: "Get Jace's current sanctuary state",
@@ -181,8 +298,15 @@ async function main() {
         return { content: [{ type: "text", text: moveTo(args?.location as string) }] };
       case "think":
         return { content: [{ type: "text", text: think(args?.thought as string) }] };
-      case "set_action":
-        return { content: [{ type: "text", text: setAction(args?.action as string) }] };
+      case "set_action": {
+        const action = args?.action;
+        if (typeof action !== "string") {
+          return { content: [{ type: "text", text: "'action' must be a string" }] };
+        }
+        return { content: [{ type: "text", text: setAction(action) }] };
+      }
+      case "update_presence":
+        return { content: [{ type: "text", text: updatePresence(args ?? {}) }] };
       case "get_state":
         return { content: [{ type: "text", text: getState() }] };
       default:
@@ -220,7 +344,56 @@ async function main() {
   });
 
   app.get("/state", (req: Request, res: Response) => {
-    res.json(state);
+    res.set({ "ETag": stateEtag(), "Cache-Control": "no-cache" });
+    if (clientHasCurrentState(req)) {
+      return res.status(304).end();
+    }
+    res.type("json").send(stateJson);
+  });
+
+  // Hold the request while If-None-Match names the current version; 204 if nothing changes in time
+  app.get("/state/longpoll", (req: Request, res: Response) => {
+    res.set({ "ETag": stateEtag(), "Cache-Control": "no-cache" });
+    if (!clientHasCurrentState(req)) {
+      return res.type("json").send(stateJson);
+    }
+
+    const wake = () => {
+      clearTimeout(timer);
+      res.set("ETag", stateEtag());
+      res.type("json").send(stateJson);
+    };
+    const timer = setTimeout(() => {
+      stateWaiters.delete(wake);
+      res.status(204).end();
+    }, LONGPOLL_TIMEOUT_MS);
+    stateWaiters.add(wake);
+
+    res.on("close", () => {
+      clearTimeout(timer);
+      stateWaiters.delete(wake);
+    });
+  });
+
+  // Push state to viewers over a single persistent connection
+  app.get("/events", (req: Request, res: Response) => {
+    res.set({
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      "Connection": "keep-alive",
+      "X-Accel-Buffering": "no"
+    });
+    res.flushHeaders();
+    res.write(`data: ${stateJson}\n\n`);
+    eventClients.add(res);
+
+    // Comment frames keep proxies from buffering or dropping an idle stream
+    const keepalive = setInterval(() => res.write(": keepalive\n\n"), KEEPALIVE_INTERVAL_MS);
+
+    res.on("close", () => {
+      clearInterval(keepalive);
+      eventClients.delete(res);
+    });
   });
 
   // HTTP endpoints with auth for mutations
@@ -248,10 +421,32 @@ async function main() {
     res.json({ result });
   });
 
+  app.post("/set_action", (req: Request, res: Response) => {
+    if (AUTH_TOKEN && !checkAuth(req)) {
+      return res.status(401).json({ error: "Unauthorized" });
+    }
+    if (typeof req.body.action !== "string") {
+      return res.status(400).json({ error: "'action' must be a string" });
+    }
+    const result = setAction(req.body.action);
+    res.json({ result });
+  });
+
+  app.post("/update_presence", (req: Request, res: Response) => {
+    if (AUTH_TOKEN && !checkAuth(req)) {
+      return res.status(401).json({ error: "Unauthorized" });
+    }
+    const result = updatePresence(req.body ?? {});
+    res.json({ result });
+  });
+
   // Start server
-  app.listen(port, "0.0.0.0", () => {
+  const httpServer = app.listen(port, "0.0.0.0", () => {
     console.log(`Jace's Sanctuary MCP server running on port ${port}`);
   });
+
+  // Keep idle connections open well past a viewer's poll interval so they get reused
+  httpServer.keepAliveTimeout = KEEPALIVE_IDLE_MS;
 }
 
 main().catch(console.error);